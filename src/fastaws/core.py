@@ -1,7 +1,7 @@
 import json
 import urllib.parse as urllib
 from datetime import date, datetime
-from typing import Dict
+from typing import Any, Dict, Tuple
 
 import httpx
 from structlog import get_logger
@@ -30,7 +30,7 @@ class AwsClient:
         self.host = host
         self.version = version
 
-    async def _make_request(
+    def _sign_request(
         self,
         *,
         method: str,
@@ -39,8 +39,9 @@ class AwsClient:
         endpoint: str = "/",
         params: Dict | None = None,
         extra_headers: Dict | None = None,
-        data: Dict | None = None,
-    ) -> httpx.Response:
+        data: Dict | bytes | None = None,
+        payload_hash: str | None = None,
+    ) -> Dict[str, Any]:
         host = host or self.host
 
         utcnow = datetime.utcnow()
@@ -63,16 +64,30 @@ class AwsClient:
                 canonical_querystring_parts.append(item_querystring)
         canonical_querystring = "&".join(sorted(canonical_querystring_parts))
 
-        canonical_headers = f"host:{host}\nx-amz-date:{amz_date}\n"
-        signed_headers = "host;x-amz-date"
-
         payload = None
         if data is not None:
             if isinstance(data, dict):
                 payload = json.dumps(data)
             elif isinstance(data, bytes):
                 payload = data
-        payload_hash = get_hash("" if payload is None else payload)
+        if payload_hash is None:
+            payload_hash = get_hash("" if payload is None else payload)
+
+        # Every x-amz-* header has to be signed, or S3 rejects the request
+        canonical_header_values = {
+            "host": host,
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": amz_date,
+        }
+        if extra_headers:
+            for k, v in extra_headers.items():
+                if k.lower().startswith("x-amz-"):
+                    canonical_header_values[k.lower()] = " ".join(str(v).split())
+        canonical_header_names = sorted(canonical_header_values)
+        canonical_headers = "".join(
+            f"{k}:{canonical_header_values[k]}\n" for k in canonical_header_names
+        )
+        signed_headers = ";".join(canonical_header_names)
 
         canonical_request_parts = [
             method,
@@ -119,12 +134,32 @@ class AwsClient:
         if extra_headers:
             headers.update(extra_headers)
 
+        request_kwargs = {
+            "method": method,
+            "url": f"https://{host}{endpoint}?{canonical_querystring}",
+            "headers": headers,
+            "content": payload,
+        }
+
+        return request_kwargs
+
+    async def _make_request(self, **kwargs) -> httpx.Response:
+        request_kwargs = self._sign_request(**kwargs)
+
         async with httpx.AsyncClient(timeout=None) as client:
-            res = await client.request(
-                method=method,
-                url=f"https://{host}{endpoint}?{canonical_querystring}",
-                headers=headers,
-                content=payload,
-            )
+            res = await client.request(**request_kwargs)
 
         return res
+
+    async def _make_raw_request(self, **kwargs) -> Tuple[httpx.Response, bytes]:
+        """
+        Like `_make_request`, but also returns the body as sent over the wire, without
+        httpx decoding its Content-Encoding.
+        """
+        request_kwargs = self._sign_request(**kwargs)
+
+        async with httpx.AsyncClient(timeout=None) as client:
+            async with client.stream(**request_kwargs) as res:
+                content = b"".join([chunk async for chunk in res.aiter_raw()])
+
+        return res, content
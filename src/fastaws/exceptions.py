@@ -14,3 +14,43 @@ class UnsupportedActionError(Exception):
 
     def __str__(self):
         return f"Unsupported action {self.action} for provider {self.provider}"
+
+
+class ChecksumMismatchError(Exception):
+    def __init__(self, algorithm: str, expected: str, actual: str):
+        self.algorithm = algorithm
+        self.expected = expected
+        self.actual = actual
+
+    def __str__(self):
+        return (
+            f"{self.algorithm} checksum mismatch. "
+            f"Expected: {self.expected}, actual: {self.actual}"
+        )
+
+
+class ChecksumUnavailableError(Exception):
+    def __init__(self, checksum_headers: list[str]):
+        self.checksum_headers = checksum_headers
+
+    def __str__(self):
+        return (
+            "No verifiable full-object checksum. "
+            f"Checksum headers: {self.checksum_headers or None}"
+        )
+
+
+class UnsupportedContentEncodingError(Exception):
+    def __init__(self, content_encoding: str):
+        self.content_encoding = content_encoding
+
+    def __str__(self):
+        return f"Unsupported content encoding {self.content_encoding}"
+
+
+class TruncatedPayloadError(Exception):
+    def __init__(self, content_encoding: str):
+        self.content_encoding = content_encoding
+
+    def __str__(self):
+        return f"Payload ended before the end of its {self.content_encoding} stream"
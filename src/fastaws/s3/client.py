@@ -1,13 +1,17 @@
+import asyncio
 from datetime import date, datetime
 from typing import Any, Literal
 from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup, Tag
 
+from fastaws.auth import get_hash
 from fastaws.core import AwsClient
 from fastaws.enums import Service
 from fastaws.exceptions import UnsupportedActionError
 
+from .codecs import (CHUNK_SIZE, ChecksumAlgorithm, ContentEncoding,
+                     decode_payload, encode_payload)
 from .models import S3ListObjectsRes, S3Object, S3ObjectOwner
 
 AmzAcl = (
@@ -126,23 +130,127 @@ class S3Client(AwsClient):
         data: Any,
         remote_filepath: str,
         access: AmzAcl = "private",
+        content_encoding: ContentEncoding | None = None,
+        checksum_algorithm: ChecksumAlgorithm | None = None,
     ):
         """
         `remote_filepath` must start with a "/"
+
+        `str` and bytes-like data is compressed with `content_encoding` and hashed in
+        a single pass in a worker thread. `checksum_algorithm` has S3 verify the
+        upload against the matching `x-amz-checksum-*` header.
         """
         f_remote_filepath = urlparse(remote_filepath).path
 
+        extra_headers = {"x-amz-acl": access}
+        payload_hash = None
+        if isinstance(data, str):
+            data = data.encode()
+        elif isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        elif not isinstance(data, bytes) and (
+            content_encoding is not None or checksum_algorithm is not None
+        ):
+            raise TypeError(
+                "`content_encoding` and `checksum_algorithm` require `str` or "
+                f"bytes-like data, not {type(data).__name__}"
+            )
+        if (
+            isinstance(data, bytes)
+            and content_encoding is None
+            and checksum_algorithm is None
+        ):
+            # Nothing to encode, so only the SigV4 payload hash is needed
+            if len(data) > CHUNK_SIZE:
+                payload_hash = await asyncio.to_thread(get_hash, data)
+        elif isinstance(data, bytes):
+            encoded_payload = await asyncio.to_thread(
+                encode_payload,
+                data,
+                content_encoding=content_encoding,
+                checksum_algorithm=checksum_algorithm,
+            )
+            data = encoded_payload.data
+            payload_hash = encoded_payload.payload_hash
+            extra_headers.update(encoded_payload.checksum_headers)
+            if content_encoding is not None:
+                extra_headers["Content-Encoding"] = content_encoding
+
         res = await self._make_request(
             method="PUT",
             action="PutObject",
             host=f"{bucket}.{self.host}",
             endpoint=f_remote_filepath,
-            extra_headers={"x-amz-acl": access},
+            extra_headers=extra_headers,
             data=data,
+            payload_hash=payload_hash,
         )
 
         return res
 
+    async def get_object(
+        self,
+        bucket: str,
+        *,
+        remote_filepath: str,
+        decode: bool = True,
+        verify_checksum: bool = False,
+    ) -> bytes:
+        """
+        `remote_filepath` must start with a "/"
+
+        With `decode`, gzip and zstd objects are decompressed according to their
+        Content-Encoding. Any other coding raises an `UnsupportedContentEncodingError`
+        and a body cut off mid-stream a `TruncatedPayloadError`.
+
+        With `verify_checksum`, the object's stored checksum is checked against the
+        downloaded bytes and a `ChecksumMismatchError` is raised on mismatch, or a
+        `ChecksumUnavailableError` if the object has no full-object checksum to check.
+
+        Both run in a single pass in a worker thread.
+        """
+        f_remote_filepath = urlparse(remote_filepath).path
+
+        extra_headers = {}
+        if verify_checksum:
+            extra_headers["x-amz-checksum-mode"] = "ENABLED"
+
+        res, content = await self._make_raw_request(
+            method="GET",
+            action="GetObject",
+            host=f"{bucket}.{self.host}",
+            endpoint=f_remote_filepath,
+            extra_headers=extra_headers,
+        )
+        res.raise_for_status()
+
+        headers = {k.lower(): v for k, v in res.headers.items()}
+        data = await asyncio.to_thread(
+            decode_payload,
+            content,
+            headers=headers,
+            decode=decode,
+            verify_checksum=verify_checksum,
+        )
+
+        return data
+
+    async def delete_object(self, bucket: str, *, remote_filepath: str):
+        """
+        `remote_filepath` must start with a "/"
+        """
+        f_remote_filepath = urlparse(remote_filepath).path
+
+        res = await self._make_request(
+            method="DELETE",
+            action="DeleteObject",
+            host=f"{bucket}.{self.host}",
+            endpoint=f_remote_filepath,
+        )
+        res.raise_for_status()
+
+        return res
+
     async def get_object_attributes(self, bucket: str, *, key: str):
         if self.provider == "digitaloceanspaces":
             raise UnsupportedActionError(self.provider, "GetObjectAttributes")
@@ -0,0 +1,307 @@
+import base64
+import hashlib
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Literal
+
+from fastaws.exceptions import (ChecksumMismatchError, ChecksumUnavailableError,
+                                TruncatedPayloadError,
+                                UnsupportedContentEncodingError)
+
+ContentEncoding = Literal["gzip"] | Literal["zstd"]
+ChecksumAlgorithm = (
+    Literal["CRC32"]
+    | Literal["CRC32C"]
+    | Literal["CRC64NVME"]
+    | Literal["SHA1"]
+    | Literal["SHA256"]
+)
+CHECKSUM_ALGORITHMS = ("CRC64NVME", "CRC32", "CRC32C", "SHA1", "SHA256")
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class EncodedPayload:
+    data: bytes
+    payload_hash: str
+    checksum_headers: Dict[str, str]
+
+
+class _Crc32:
+    def __init__(self):
+        self.value = 0
+
+    def update(self, chunk: bytes):
+        self.value = zlib.crc32(chunk, self.value)
+
+    def digest(self) -> bytes:
+        return self.value.to_bytes(4, "big")
+
+
+class _Crc32c(_Crc32):
+    def __init__(self):
+        try:
+            import crc32c
+        except ImportError:
+            raise ImportError(
+                "CRC32C checksums require the `crc32c` package "
+                "(pip install fastaws[crc32c])"
+            )
+        super().__init__()
+        self._crc32c = crc32c.crc32c
+
+    def update(self, chunk: bytes):
+        self.value = self._crc32c(chunk, self.value)
+
+
+class _Crc64Nvme:
+    def __init__(self):
+        try:
+            from awscrt import checksums
+        except ImportError:
+            raise ImportError(
+                "CRC64NVME checksums require the `awscrt` package "
+                "(pip install fastaws[crc64nvme])"
+            )
+        self.value = 0
+        self._crc64nvme = checksums.crc64nvme
+
+    def update(self, chunk: bytes):
+        self.value = self._crc64nvme(chunk, self.value)
+
+    def digest(self) -> bytes:
+        return self.value.to_bytes(8, "big")
+
+
+def _get_checksum(algorithm: ChecksumAlgorithm):
+    match algorithm:
+        case "CRC32":
+            return _Crc32()
+        case "CRC32C":
+            return _Crc32c()
+        case "CRC64NVME":
+            return _Crc64Nvme()
+        case "SHA1":
+            return hashlib.sha1()
+        case "SHA256":
+            return hashlib.sha256()
+        case _:
+            raise ValueError(f"Unsupported checksum algorithm {algorithm!r}")
+
+
+def _get_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd content encoding requires the `zstandard` package "
+            "(pip install fastaws[zstd])"
+        )
+
+    return zstandard
+
+
+def _get_compressor(content_encoding: ContentEncoding):
+    match content_encoding:
+        case "gzip":
+            return zlib.compressobj(wbits=31)
+        case "zstd":
+            return _get_zstandard().ZstdCompressor().compressobj()
+        case _:
+            raise ValueError(f"Unsupported content encoding {content_encoding!r}")
+
+
+def _get_decompressor(content_encoding: str):
+    match content_encoding:
+        case "gzip":
+            return zlib.decompressobj(wbits=31)
+        case "zstd":
+            return _get_zstandard().ZstdDecompressor().decompressobj()
+        case _:
+            raise UnsupportedContentEncodingError(content_encoding)
+
+
+class _Decoder:
+    """
+    Decodes one coding of a body, starting a new decompressor for every gzip member
+    or zstd frame, and raises on a body that ends mid-stream.
+    """
+
+    def __init__(self, content_encoding: str):
+        self.content_encoding = content_encoding
+        self.decompressor = _get_decompressor(content_encoding)
+        self.started = False
+
+    def decompress(self, data: bytes | memoryview) -> bytes:
+        chunks = []
+        while data:
+            if self.decompressor.eof:
+                self.decompressor = _get_decompressor(self.content_encoding)
+            self.started = True
+            chunks.append(self.decompressor.decompress(data))
+            data = self.decompressor.unused_data if self.decompressor.eof else b""
+
+        return b"".join(chunks)
+
+    def flush(self) -> bytes:
+        tail = b""
+        if hasattr(self.decompressor, "flush"):
+            tail = self.decompressor.flush()
+        if self.started and not self.decompressor.eof:
+            raise TruncatedPayloadError(self.content_encoding)
+
+        return tail
+
+
+def _get_decoders(content_encoding: str) -> List[_Decoder]:
+    """
+    Content-Encoding lists codings in the order they were applied, so they're undone
+    in reverse. "aws-chunked" only describes how the upload was sent.
+    """
+    content_encodings = [
+        encoding.strip().lower() for encoding in content_encoding.split(",")
+    ]
+    decoders = [
+        _Decoder(encoding)
+        for encoding in reversed(content_encodings)
+        if encoding not in ("", "identity", "aws-chunked")
+    ]
+
+    return decoders
+
+
+def _decompress(decoders: List[_Decoder], chunk: bytes | memoryview) -> bytes:
+    for decoder in decoders:
+        chunk = decoder.decompress(chunk)
+
+    return bytes(chunk)
+
+
+def _flush(decoders: List[_Decoder]) -> bytes:
+    tail = b""
+    for decoder in decoders:
+        tail = decoder.decompress(tail) + decoder.flush()
+
+    return tail
+
+
+def encode_payload(
+    data: bytes,
+    *,
+    content_encoding: ContentEncoding | None = None,
+    checksum_algorithm: ChecksumAlgorithm | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> EncodedPayload:
+    """
+    Compresses `data` and hashes the result in a single pass over its chunks. The
+    SHA-256 doubles as the SigV4 payload hash, and `checksum_algorithm` adds the
+    matching `x-amz-checksum-*` header.
+
+    This is CPU bound and meant to be run off the event loop.
+    """
+    compressor = _get_compressor(content_encoding) if content_encoding else None
+    payload_hash = hashlib.sha256()
+    checksum = None
+    if checksum_algorithm is not None and checksum_algorithm != "SHA256":
+        checksum = _get_checksum(checksum_algorithm)
+
+    encoded_chunks = []
+
+    def update(chunk: bytes | memoryview):
+        if not chunk:
+            return
+        payload_hash.update(chunk)
+        if checksum is not None:
+            checksum.update(chunk)
+        if compressor is not None:
+            encoded_chunks.append(chunk)
+
+    view = memoryview(data)
+    for i in range(0, len(view), chunk_size):
+        chunk = view[i : i + chunk_size]
+        update(compressor.compress(chunk) if compressor else chunk)
+    if compressor is not None:
+        update(compressor.flush())
+
+    checksum_headers = {}
+    if checksum_algorithm is not None:
+        digest = (checksum or payload_hash).digest()
+        checksum_header = f"x-amz-checksum-{checksum_algorithm.lower()}"
+        checksum_headers[checksum_header] = base64.b64encode(digest).decode()
+
+    encoded_payload = EncodedPayload(
+        data=b"".join(encoded_chunks) if compressor is not None else data,
+        payload_hash=payload_hash.hexdigest(),
+        checksum_headers=checksum_headers,
+    )
+
+    return encoded_payload
+
+
+def decode_payload(
+    data: bytes,
+    *,
+    headers: Dict[str, str],
+    decode: bool = True,
+    verify_checksum: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+) -> bytes:
+    """
+    When `verify_checksum` is set, checks the full-object `x-amz-checksum-*` header
+    in `headers` against `data`, and when `decode` is set, decompresses it according
+    to its Content-Encoding, both in a single pass over its chunks.
+
+    This is CPU bound and meant to be run off the event loop.
+    """
+    checksum = None
+    expected_checksum = None
+    checksum_algorithm = None
+    if verify_checksum:
+        for algorithm in CHECKSUM_ALGORITHMS:
+            value = headers.get(f"x-amz-checksum-{algorithm.lower()}")
+            # Checksums of multipart uploads can be composite ("<checksum>-<parts>")
+            # and can't be checked against the object bytes
+            if value is None or "-" in value:
+                continue
+            checksum_algorithm = algorithm
+            checksum = _get_checksum(algorithm)
+            expected_checksum = value
+            break
+        else:
+            checksum_headers = sorted(
+                k for k in headers if k.startswith("x-amz-checksum-")
+            )
+            raise ChecksumUnavailableError(checksum_headers)
+
+    decoders = []
+    if decode:
+        decoders = _get_decoders(headers.get("content-encoding", ""))
+
+    if checksum is None and not decoders:
+        return data
+
+    decoded_chunks = []
+    view = memoryview(data)
+    for i in range(0, len(view), chunk_size):
+        chunk = view[i : i + chunk_size]
+        if checksum is not None:
+            checksum.update(chunk)
+        if decoders:
+            decoded_chunks.append(_decompress(decoders, chunk))
+
+    if checksum is not None:
+        assert checksum_algorithm is not None and expected_checksum is not None
+        actual_checksum = base64.b64encode(checksum.digest()).decode()
+        if actual_checksum != expected_checksum:
+            raise ChecksumMismatchError(
+                checksum_algorithm, expected_checksum, actual_checksum
+            )
+
+    if decoders:
+        decoded_chunks.append(_flush(decoders))
+
+    if not decoders:
+        return data
+
+    return b"".join(decoded_chunks)
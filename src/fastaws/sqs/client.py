@@ -1,18 +1,25 @@
+import asyncio
 import json
 from datetime import date
 from typing import Any, Dict, List
+from uuid import uuid4
 
 from structlog import get_logger
 
 from fastaws.core import AwsClient
 from fastaws.enums import Service
+from fastaws.s3.client import S3Client
 
 from .models import (SqsGetQueuesResponse, SqsReceiveMessageResponse,
-                     SqsSendMessageResponse)
-from .utils import get_endpoint_from_url
+                     SqsS3Pointer, SqsSendMessageResponse)
+from .utils import (dump_s3_pointer, embed_s3_pointer, extract_s3_pointer,
+                    get_endpoint_from_url, load_s3_pointer)
 
 logger = get_logger()
 
+# SQS rejects message bodies over 256 KiB
+MAX_MESSAGE_SIZE = 262_144
+
 
 class SqsClient(AwsClient):
     def __init__(
@@ -21,7 +28,31 @@ class SqsClient(AwsClient):
         access_key: str,
         secret_key: str,
         region: str,
+        s3_client: S3Client | None = None,
+        s3_bucket: str | None = None,
+        s3_key_prefix: str = "",
+        compress_payloads: bool = False,
+        payload_size_threshold: int = MAX_MESSAGE_SIZE,
     ):
+        """
+        Passing `s3_client` and `s3_bucket` enables the extended client mode: message
+        bodies larger than `payload_size_threshold` bytes are stored in S3 (gzipped
+        when `compress_payloads` is set) and a small pointer is sent in their place.
+        `get_messages` resolves pointers back into the original bodies and
+        `delete_message` removes the S3 object along with the message.
+
+        Pointers are only followed into `s3_bucket` under `s3_key_prefix` (treated as
+        a directory). With the default empty prefix, anyone who can write to the
+        queue can make consumers read and delete any object in `s3_bucket`, so use a
+        dedicated bucket or set a prefix.
+        """
+        if (s3_client is None) != (s3_bucket is None):
+            raise ValueError("`s3_client` and `s3_bucket` must be passed together")
+        if payload_size_threshold > MAX_MESSAGE_SIZE:
+            raise ValueError(
+                f"`payload_size_threshold` must not exceed {MAX_MESSAGE_SIZE} bytes"
+            )
+
         super().__init__(
             access_key=access_key,
             secret_key=secret_key,
@@ -30,6 +61,14 @@ class SqsClient(AwsClient):
             host=f"sqs.{region}.amazonaws.com",
             version=date(year=2012, month=11, day=5),
         )
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        # Keys are sent as "/{key}", so a leading "/" would be parsed as a netloc. A
+        # trailing "/" keeps "p" from also matching keys like "private/..."
+        s3_key_prefix = s3_key_prefix.strip("/")
+        self.s3_key_prefix = f"{s3_key_prefix}/" if s3_key_prefix else ""
+        self.compress_payloads = compress_payloads
+        self.payload_size_threshold = payload_size_threshold
 
     async def _make_request(
         self,
@@ -119,14 +158,79 @@ class SqsClient(AwsClient):
 
         return queue_url
 
-    async def send_message(self, queue_url: str, *, message_body: str | Dict):
-        data = await self._make_request(
-            method="POST",
-            endpoint=get_endpoint_from_url(queue_url),
-            action="SendMessage",
-            params={"MessageBody": message_body},
+    async def _put_payload(self, payload: bytes) -> SqsS3Pointer:
+        assert self.s3_client is not None and self.s3_bucket is not None
+
+        key = f"{self.s3_key_prefix}{uuid4()}"
+
+        res = await self.s3_client.put_object(
+            self.s3_bucket,
+            data=payload,
+            remote_filepath=f"/{key}",
+            content_encoding="gzip" if self.compress_payloads else None,
+        )
+        res.raise_for_status()
+
+        pointer = SqsS3Pointer(bucket=self.s3_bucket, key=key, size=len(payload))
+
+        return pointer
+
+    def _check_s3_location(self, bucket: str, key: str):
+        """
+        Pointers come from whoever can write to the queue, so only objects this client
+        could have offloaded are read or deleted.
+        """
+        if bucket != self.s3_bucket or not key.startswith(self.s3_key_prefix):
+            raise ValueError(
+                f"S3 payload location s3://{bucket}/{key} is outside of "
+                f"s3://{self.s3_bucket}/{self.s3_key_prefix}"
+            )
+
+    async def _get_payload(self, pointer: SqsS3Pointer) -> str:
+        assert self.s3_client is not None
+        self._check_s3_location(pointer.bucket, pointer.key)
+
+        payload = await self.s3_client.get_object(
+            pointer.bucket, remote_filepath=f"/{pointer.key}"
+        )
+
+        return payload.decode()
+
+    async def _delete_payload(self, pointer: SqsS3Pointer):
+        assert self.s3_client is not None
+
+        await self.s3_client.delete_object(
+            pointer.bucket, remote_filepath=f"/{pointer.key}"
         )
+
+    async def send_message(self, queue_url: str, *, message_body: str | Dict):
+        pointer = None
+        if self.s3_client is not None:
+            f_message_body = (
+                message_body
+                if isinstance(message_body, str)
+                else json.dumps(message_body)
+            )
+            message_body = f_message_body
+            payload = f_message_body.encode()
+            if len(payload) > self.payload_size_threshold:
+                pointer = await self._put_payload(payload)
+                message_body = dump_s3_pointer(pointer)
+
+        try:
+            data = await self._make_request(
+                method="POST",
+                endpoint=get_endpoint_from_url(queue_url),
+                action="SendMessage",
+                params={"MessageBody": message_body},
+            )
+        except BaseException:
+            if pointer is not None:
+                await self._delete_payload(pointer)
+            raise
         if data is None:
+            if pointer is not None:
+                await self._delete_payload(pointer)
             return
 
         send_message_response = SqsSendMessageResponse(
@@ -166,15 +270,94 @@ class SqsClient(AwsClient):
             )
             receive_messages_response.append(receive_message_response)
 
+        if self.s3_client is not None:
+            receive_messages_response = await self._resolve_payloads(
+                receive_messages_response
+            )
+
         return receive_messages_response
 
+    async def _resolve_payloads(
+        self, messages: List[SqsReceiveMessageResponse]
+    ) -> List[SqsReceiveMessageResponse]:
+        """
+        Messages with a malformed pointer or whose payload can't be fetched are logged
+        and left out, so they're redelivered (and eventually dead-lettered) without
+        failing the whole batch.
+        """
+        pointers = []
+        for message in messages:
+            try:
+                pointer = load_s3_pointer(message.body)
+            except ValueError as e:
+                logger.error(
+                    "Skipping message with malformed S3 pointer",
+                    message_id=message.message_id,
+                    error=repr(e),
+                )
+                pointer = e
+            pointers.append(pointer)
+
+        payloads = await asyncio.gather(
+            *[
+                self._get_payload(pointer)
+                for pointer in pointers
+                if isinstance(pointer, SqsS3Pointer)
+            ],
+            return_exceptions=True,
+        )
+        payloads_iter = iter(payloads)
+
+        resolved_messages = []
+        for message, pointer in zip(messages, pointers):
+            if pointer is None:
+                resolved_messages.append(message)
+                continue
+            if isinstance(pointer, ValueError):
+                continue
+            payload = next(payloads_iter)
+            if isinstance(payload, BaseException):
+                logger.error(
+                    "Failed to fetch offloaded payload",
+                    message_id=message.message_id,
+                    bucket=pointer.bucket,
+                    key=pointer.key,
+                    error=repr(payload),
+                )
+                continue
+            message.body = payload
+            message.receipt_handle = embed_s3_pointer(
+                message.receipt_handle, pointer=pointer
+            )
+            resolved_messages.append(message)
+
+        return resolved_messages
+
     async def delete_message(self, queue_url: str, *, receipt_handle: str):
-        await self._make_request(
+        s3_location = extract_s3_pointer(receipt_handle)
+        if s3_location is not None:
+            bucket, key, receipt_handle = s3_location
+            if self.s3_client is not None:
+                self._check_s3_location(bucket, key)
+
+        data = await self._make_request(
             method="POST",
             endpoint=get_endpoint_from_url(queue_url),
             action="DeleteMessage",
             params={"ReceiptHandle": receipt_handle},
         )
+        if data is None:
+            return
+
+        if s3_location is not None:
+            if self.s3_client is None:
+                logger.warning(
+                    "Offloaded payload not deleted, no S3 client configured",
+                    bucket=bucket,
+                    key=key,
+                )
+                return
+            await self.s3_client.delete_object(bucket, remote_filepath=f"/{key}")
 
     async def delete_queue(self, queue_url: str):
         """
@@ -19,3 +19,10 @@ class SqsReceiveMessageResponse:
 class SqsGetQueuesResponse:
     queue_urls: List[str]
     next_token: str | None
+
+
+@dataclass
+class SqsS3Pointer:
+    bucket: str
+    key: str
+    size: int
@@ -1,5 +1,88 @@
+import json
+import re
+
+from .models import SqsS3Pointer
+
+S3_POINTER_KEY = "fastaws.S3Pointer"
+
+_BUCKET_MARKER = "-..s3BucketName..-"
+_KEY_MARKER = "-..s3Key..-"
+_RECEIPT_HANDLE_RE = re.compile(
+    f"^{re.escape(_BUCKET_MARKER)}(?P<bucket>.+?){re.escape(_BUCKET_MARKER)}"
+    f"{re.escape(_KEY_MARKER)}(?P<key>.+?){re.escape(_KEY_MARKER)}"
+    "(?P<receipt_handle>.*)$",
+    re.DOTALL,
+)
+
+
 def get_endpoint_from_url(queue_url: str):
     endpoint = "/".join(queue_url.split("/")[-2:])
     endpoint = "/" + endpoint
 
     return endpoint
+
+
+def dump_s3_pointer(pointer: SqsS3Pointer) -> str:
+    pointer_data = {
+        "bucket": pointer.bucket,
+        "key": pointer.key,
+        "size": pointer.size,
+    }
+
+    return json.dumps({S3_POINTER_KEY: pointer_data})
+
+
+def load_s3_pointer(message_body: str) -> SqsS3Pointer | None:
+    """
+    Returns `None` for bodies that aren't pointers and raises `ValueError` for
+    malformed ones.
+    """
+    if S3_POINTER_KEY not in message_body:
+        return
+    try:
+        data = json.loads(message_body)
+    except json.JSONDecodeError:
+        return
+    if not isinstance(data, dict) or S3_POINTER_KEY not in data:
+        return
+
+    pointer_data = data[S3_POINTER_KEY]
+    if not (
+        isinstance(pointer_data, dict)
+        and isinstance(pointer_data.get("bucket"), str)
+        and isinstance(pointer_data.get("key"), str)
+        and isinstance(pointer_data.get("size"), int)
+    ):
+        raise ValueError(f"Malformed S3 pointer: {pointer_data!r}")
+
+    pointer = SqsS3Pointer(
+        bucket=pointer_data["bucket"],
+        key=pointer_data["key"],
+        size=pointer_data["size"],
+    )
+
+    return pointer
+
+
+def embed_s3_pointer(receipt_handle: str, *, pointer: SqsS3Pointer) -> str:
+    """
+    Prefix a receipt handle with the S3 location of its offloaded payload so that
+    `delete_message` can clean up the object without any local state.
+    """
+    return (
+        f"{_BUCKET_MARKER}{pointer.bucket}{_BUCKET_MARKER}"
+        f"{_KEY_MARKER}{pointer.key}{_KEY_MARKER}"
+        f"{receipt_handle}"
+    )
+
+
+def extract_s3_pointer(receipt_handle: str) -> tuple[str, str, str] | None:
+    """
+    Returns `(bucket, key, receipt_handle)` for a receipt handle created by
+    `embed_s3_pointer`, or `None` for a plain receipt handle.
+    """
+    match = _RECEIPT_HANDLE_RE.match(receipt_handle)
+    if match is None:
+        return
+
+    return match["bucket"], match["key"], match["receipt_handle"]